@@ -1,14 +1,19 @@
 # ai_processor.py - AI Integration for Form Processing
 
 import os
+import asyncio
+import functools
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import json
-from openai import OpenAI
+import httpx
+from openai import OpenAI, AsyncOpenAI
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 from dotenv import load_dotenv
 from logger import get_logger
+from logic.llm_cache import LLMCache, SemanticLLMCache
 import PyPDF2
 from PIL import Image
 import pytesseract
@@ -16,6 +21,119 @@ import pytesseract
 load_dotenv()
 logger = get_logger(__name__)
 
+PROMPTS_PATH = "prompts/prompt.txt"
+
+# Shared OpenAI clients: one pooled transport for all AIProcessor
+# instances instead of a new httpx client + TLS handshake per instance
+_shared_client = None
+_shared_async_client = None
+
+# Shared semantic cache: processors are built per request, so an
+# instance-level index would start empty every time and never hit
+_shared_semantic_cache = None
+
+def _get_shared_semantic_cache(client: OpenAI) -> SemanticLLMCache:
+    """Build (once) and return the process-wide semantic cache."""
+    global _shared_semantic_cache
+
+    if _shared_semantic_cache is None:
+        _shared_semantic_cache = SemanticLLMCache(client)
+
+    return _shared_semantic_cache
+
+def _get_shared_clients(api_key: str) -> Tuple[OpenAI, AsyncOpenAI]:
+    """Build (once) and return the shared sync and async OpenAI clients."""
+    global _shared_client, _shared_async_client
+
+    if _shared_client is None:
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        try:
+            # HTTP/2 multiplexes the concurrent batch-path requests
+            http_client = httpx.Client(http2=True, limits=limits)
+            async_http_client = httpx.AsyncClient(http2=True, limits=limits)
+        except ImportError:
+            # h2 not installed; pooled HTTP/1.1 still avoids per-instance handshakes
+            http_client = httpx.Client(limits=limits)
+            async_http_client = httpx.AsyncClient(limits=limits)
+
+        _shared_client = OpenAI(api_key=api_key, http_client=http_client)
+        _shared_async_client = AsyncOpenAI(api_key=api_key, http_client=async_http_client)
+
+    return _shared_client, _shared_async_client
+
+# Scans larger than this are downscaled before OCR
+OCR_MAX_DIMENSION = 2000
+
+def _otsu_threshold(histogram: List[int]) -> int:
+    """Compute the OTSU binarization threshold from a grayscale histogram."""
+    total = sum(histogram)
+    sum_total = sum(i * count for i, count in enumerate(histogram))
+
+    sum_bg = 0.0
+    weight_bg = 0
+    best_threshold = 0
+    best_variance = -1.0
+
+    for i, count in enumerate(histogram):
+        weight_bg += count
+        if weight_bg == 0:
+            continue
+        weight_fg = total - weight_bg
+        if weight_fg == 0:
+            break
+
+        sum_bg += i * count
+        mean_bg = sum_bg / weight_bg
+        mean_fg = (sum_total - sum_bg) / weight_fg
+
+        variance = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+        if variance > best_variance:
+            best_variance = variance
+            best_threshold = i
+
+    return best_threshold
+
+def _preprocess_image_for_ocr(image: "Image.Image") -> "Image.Image":
+    """
+    Prepare an image for fast OCR: grayscale, downscale oversized
+    scans, and OTSU-binarize so tesseract processes fewer, cleaner
+    pixels.
+    """
+    gray = image.convert("L")
+
+    width, height = gray.size
+    largest = max(width, height)
+    if largest > OCR_MAX_DIMENSION:
+        scale = OCR_MAX_DIMENSION / largest
+        gray = gray.resize((int(width * scale), int(height * scale)), Image.LANCZOS)
+
+    threshold = _otsu_threshold(gray.histogram())
+    return gray.point(lambda p: 255 if p > threshold else 0)
+
+@functools.lru_cache(maxsize=1)
+def _load_prompts_cached(path: str, mtime: float) -> Dict[str, str]:
+    """
+    Load and parse AI prompts from file.
+
+    Cached at module level so per-request AIProcessor construction does
+    not re-read and re-parse the file; mtime in the key invalidates the
+    cache automatically when the file is edited.
+    """
+    with open(path, "r") as f:
+        content = f.read()
+
+    # Parse prompts by sections
+    prompts = {}
+    sections = content.split("##")
+    for section in sections:
+        if section.strip():
+            lines = section.strip().split("\n", 1)
+            if len(lines) == 2:
+                key = lines[0].strip().lower().replace(" ", "_")
+                prompts[key] = lines[1].strip()
+
+    return prompts
+
 class AIProcessor:
     """AI-powered document processor for claim forms."""
     
@@ -25,60 +143,164 @@ class AIProcessor:
         if not self.api_key:
             logger.warning("OPENAI_API_KEY not found in environment")
             self.client = None
+            self.async_client = None
         else:
-            self.client = OpenAI(api_key=self.api_key)
+            self.client, self.async_client = _get_shared_clients(self.api_key)
         
         self.model = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
         self.max_tokens = int(os.getenv("MAX_TOKENS", "4000"))
         self.temperature = float(os.getenv("TEMPERATURE", "0.7"))
+        # Extraction is not a creative task: deterministic output also
+        # makes the calls cache-eligible
+        self.extraction_temperature = float(os.getenv("EXTRACTION_TEMPERATURE", "0.0"))
+        self.pdf_workers = int(os.getenv("PDF_PARSE_WORKERS", str(min(os.cpu_count() or 1, 4))))
+        self.pdf_max_chars = int(os.getenv("PDF_EXTRACT_MAX_CHARS", "8000"))
+        self.ocr_lang = os.getenv("OCR_LANG", "eng")
+        self.ocr_psm = os.getenv("OCR_PSM", "6")
+        self.max_validation_input_chars = int(os.getenv("MAX_VALIDATION_INPUT_CHARS", "8000"))
         
-        # Load prompts
+        # Load prompts and prebind the per-method templates so the hot
+        # path does a single .format instead of dict lookups + f-strings
         self.prompts = self._load_prompts()
+        self.system_prompt = self.prompts.get("system_prompt", "")
+        self._extraction_tmpl = self._prompt_template("extraction_prompt", "\n\nDocument Text:\n{text}")
+        self._validation_tmpl = self._prompt_template("validation_prompt", "\n\nExtracted Data:\n{data}")
+        self._decision_tmpl = self._prompt_template("decision_support_prompt", "\n\nClaim Data:\n{data}")
+
+        # Exact-match response cache (skips the API call on identical inputs)
+        self.llm_cache = LLMCache()
+
+        # Embedding-similarity cache for near-duplicate documents (OCR noise,
+        # whitespace differences). Never used for decision recommendations.
+        # Shared per process like the HTTP clients, so the index survives
+        # per-request processor construction.
+        self.semantic_cache = _get_shared_semantic_cache(self.client) if self.client else None
     
     def _load_prompts(self) -> Dict[str, str]:
-        """Load AI prompts from file."""
+        """Load AI prompts from file (cached across instances)."""
         try:
-            with open("prompts/prompt.txt", "r") as f:
-                content = f.read()
-            
-            # Parse prompts by sections
-            prompts = {}
-            sections = content.split("##")
-            for section in sections:
-                if section.strip():
-                    lines = section.strip().split("\n", 1)
-                    if len(lines) == 2:
-                        key = lines[0].strip().lower().replace(" ", "_")
-                        prompts[key] = lines[1].strip()
-            
-            return prompts
+            return _load_prompts_cached(PROMPTS_PATH, os.path.getmtime(PROMPTS_PATH))
         except Exception as e:
             logger.error(f"Error loading prompts: {e}")
             return {}
+
+    def _prompt_template(self, key: str, suffix: str) -> str:
+        """
+        Prebind a prompt template from the loaded prompt file.
+
+        Literal braces in the body (e.g. JSON examples) are escaped so
+        .format only fills the placeholder appended in the suffix.
+        """
+        body = self.prompts.get(key, "")
+        return body.replace("{", "{{").replace("}", "}}") + suffix
     
-    def extract_text_from_pdf(self, file_path: str) -> Tuple[str, int]:
+    def extract_text_from_pdf(self, file_path: str, max_chars: Optional[int] = None) -> Tuple[str, int]:
         """
         Extract text from PDF file.
-        
+
+        Args:
+            file_path: Path to the PDF file
+            max_chars: Stop parsing once this many characters are collected
+                (defaults to PDF_EXTRACT_MAX_CHARS; 0 disables the limit)
+
         Returns:
             Tuple of (extracted_text, page_count)
         """
+        if max_chars is None:
+            max_chars = self.pdf_max_chars
+
         try:
-            text = ""
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                page_count = len(pdf_reader.pages)
-                
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            
-            logger.info(f"Extracted {len(text)} characters from {page_count} pages")
+                pages = list(pdf_reader.pages)
+                page_count = len(pages)
+
+                parts = []
+                total_chars = 0
+
+                if self.pdf_workers > 1 and page_count > 1:
+                    # Parse pages in a worker pool; map preserves page order.
+                    # Pages are submitted one worker-batch at a time so we can
+                    # stop early once enough text has been collected.
+                    with ThreadPoolExecutor(max_workers=self.pdf_workers) as pool:
+                        for start in range(0, page_count, self.pdf_workers):
+                            batch = pages[start:start + self.pdf_workers]
+                            for part in pool.map(lambda page: page.extract_text() or "", batch):
+                                parts.append(part)
+                                total_chars += len(part)
+                            if max_chars and total_chars >= max_chars:
+                                break
+                else:
+                    for page in pages:
+                        part = page.extract_text() or ""
+                        parts.append(part)
+                        total_chars += len(part)
+                        if max_chars and total_chars >= max_chars:
+                            break
+
+                text = "\n".join(parts)
+
+            logger.info(f"Extracted {len(text)} characters from "
+                        f"{len(parts)} of {page_count} pages")
             return text, page_count
         
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
             return "", 0
     
+    def extract_text_from_scanned_pdf(self, file_path: str) -> Tuple[str, int]:
+        """
+        Rasterize a scanned PDF and OCR each page in parallel.
+
+        Used when PyPDF2 finds no text layer. Tesseract releases the
+        GIL, so a thread pool scales with cores; map preserves page
+        order.
+
+        Returns:
+            Tuple of (extracted_text, page_count)
+        """
+        try:
+            from pdf2image import convert_from_path
+
+            images = convert_from_path(file_path, dpi=200)
+
+            def ocr_page(image):
+                processed = _preprocess_image_for_ocr(image)
+                return pytesseract.image_to_string(
+                    processed,
+                    lang=self.ocr_lang,
+                    config=f"--oem 3 --psm {self.ocr_psm}"
+                )
+
+            with ThreadPoolExecutor(max_workers=self.pdf_workers) as pool:
+                parts = list(pool.map(ocr_page, images))
+
+            text = "\n".join(parts)
+
+            logger.info(f"OCR extracted {len(text)} characters from "
+                        f"{len(images)} scanned pages")
+            return text, len(images)
+
+        except Exception as e:
+            logger.error(f"Error extracting text from scanned PDF: {e}")
+            return "", 0
+
+    def _extract_pdf_text(self, file_path: str, max_chars: Optional[int] = None) -> Tuple[str, int]:
+        """Extract PDF text, falling back to OCR for scanned documents."""
+        text, page_count = self.extract_text_from_pdf(file_path, max_chars=max_chars)
+
+        if len(text.strip()) < 100:
+            logger.info(f"PDF has no usable text layer, falling back to OCR: {file_path}")
+            ocr_text, ocr_page_count = self.extract_text_from_scanned_pdf(file_path)
+
+            # Keep whatever the text layer gave us if OCR produced
+            # nothing (rasterization unavailable, blank scan): a short
+            # but legitimate PDF is still better than no text
+            if ocr_text.strip():
+                return ocr_text, ocr_page_count
+
+        return text, page_count
+
     def extract_text_from_image(self, file_path: str) -> str:
         """
         Extract text from image using OCR.
@@ -87,9 +309,17 @@ class AIProcessor:
             Extracted text
         """
         try:
-            image = Image.open(file_path)
-            text = pytesseract.image_to_string(image)
-            
+            # Context manager bounds FD usage under batch OCR load; the
+            # preprocessed copy outlives the source file handle
+            with Image.open(file_path) as image:
+                processed = _preprocess_image_for_ocr(image)
+
+            text = pytesseract.image_to_string(
+                processed,
+                lang=self.ocr_lang,
+                config=f"--oem 3 --psm {self.ocr_psm}"
+            )
+
             logger.info(f"Extracted {len(text)} characters from image")
             return text
         
@@ -110,22 +340,35 @@ class AIProcessor:
         
         try:
             # Prepare the extraction prompt
-            system_prompt = self.prompts.get("system_prompt", "")
-            extraction_prompt = self.prompts.get("extraction_prompt", "")
-            
-            full_prompt = f"{extraction_prompt}\n\nDocument Text:\n{document_text[:3000]}"
-            
+            full_prompt = self._extraction_tmpl.format(text=document_text[:3000])
+
+            messages = [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": full_prompt}
+            ]
+
+            # Check cache before paying for the API call
+            cache_key = self.llm_cache.cache_key(self.model, messages, self.extraction_temperature)
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # On exact miss, try the semantic cache for near-duplicate text
+            embedding = None
+            if self.semantic_cache and self.extraction_temperature <= 0.5:
+                semantic_hit, embedding = self.semantic_cache.get(document_text[:3000])
+                if semantic_hit is not None:
+                    return semantic_hit
+
             # Call OpenAI API
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": full_prompt}
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens
+                messages=messages,
+                temperature=self.extraction_temperature,
+                max_tokens=self.max_tokens,
+                response_format={"type": "json_object"}
             )
-            
+
             # Parse response
             result = response.choices[0].message.content
             
@@ -135,7 +378,11 @@ class AIProcessor:
             except json.JSONDecodeError:
                 # If not JSON, return as text
                 extracted_data = {"raw_response": result}
-            
+
+            self.llm_cache.set(cache_key, extracted_data)
+            if self.semantic_cache and embedding is not None:
+                self.semantic_cache.set(embedding, extracted_data)
+
             logger.info("Successfully extracted claim data using AI")
             return extracted_data
         
@@ -155,27 +402,37 @@ class AIProcessor:
             return {"error": "AI service not available"}
         
         try:
-            validation_prompt = self.prompts.get("validation_prompt", "")
-            
-            full_prompt = f"{validation_prompt}\n\nExtracted Data:\n{json.dumps(extracted_data, indent=2)}"
-            
+            # Compact separators save ~30% prompt tokens over indent=2
+            payload = json.dumps(extracted_data, separators=(",", ":"))[:self.max_validation_input_chars]
+            full_prompt = self._validation_tmpl.format(data=payload)
+
+            messages = [
+                {"role": "system", "content": "You are a claim validation expert. Respond with a JSON object."},
+                {"role": "user", "content": full_prompt}
+            ]
+
+            cache_key = self.llm_cache.cache_key(self.model, messages, 0.3)
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a claim validation expert."},
-                    {"role": "user", "content": full_prompt}
-                ],
+                messages=messages,
                 temperature=0.3,
-                max_tokens=2000
+                max_tokens=2000,
+                response_format={"type": "json_object"}
             )
-            
+
             result = response.choices[0].message.content
-            
+
             try:
                 validation_report = json.loads(result)
             except json.JSONDecodeError:
                 validation_report = {"raw_response": result}
-            
+
+            self.llm_cache.set(cache_key, validation_report)
+
             logger.info("Successfully validated claim data using AI")
             return validation_report
         
@@ -195,27 +452,36 @@ class AIProcessor:
             return {"error": "AI service not available"}
         
         try:
-            decision_prompt = self.prompts.get("decision_support_prompt", "")
-            
-            full_prompt = f"{decision_prompt}\n\nClaim Data:\n{json.dumps(claim_data, indent=2)}"
-            
+            payload = json.dumps(claim_data, separators=(",", ":"))[:self.max_validation_input_chars]
+            full_prompt = self._decision_tmpl.format(data=payload)
+
+            messages = [
+                {"role": "system", "content": "You are a claim decision support expert. Respond with a JSON object."},
+                {"role": "user", "content": full_prompt}
+            ]
+
+            cache_key = self.llm_cache.cache_key(self.model, messages, 0.3)
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a claim decision support expert."},
-                    {"role": "user", "content": full_prompt}
-                ],
+                messages=messages,
                 temperature=0.3,
-                max_tokens=1500
+                max_tokens=1500,
+                response_format={"type": "json_object"}
             )
-            
+
             result = response.choices[0].message.content
-            
+
             try:
                 recommendation = json.loads(result)
             except json.JSONDecodeError:
                 recommendation = {"raw_response": result}
-            
+
+            self.llm_cache.set(cache_key, recommendation)
+
             logger.info("Successfully generated decision recommendation using AI")
             return recommendation
         
@@ -238,7 +504,8 @@ class AIProcessor:
         
         # Extract text based on file type
         if file_type.lower() == 'pdf':
-            text, page_count = self.extract_text_from_pdf(file_path)
+            # Extraction only sends 3000 chars to the LLM; 2x headroom
+            text, page_count = self._extract_pdf_text(file_path, max_chars=6000)
         elif file_type.lower() in ['png', 'jpg', 'jpeg']:
             text = self.extract_text_from_image(file_path)
             page_count = 1
@@ -250,9 +517,20 @@ class AIProcessor:
         
         # Extract claim data
         extracted_data = self.extract_claim_data(text)
-        
-        # Validate extracted data
-        validation_report = self.validate_extracted_data(extracted_data)
+
+        # Don't spend another LLM round-trip validating garbage input
+        if "error" in extracted_data:
+            return {
+                "error": extracted_data["error"],
+                "extracted_text": text[:500],
+                "page_count": page_count
+            }
+
+        if "raw_response" in extracted_data:
+            validation_report = {"skipped": "extraction_unparseable"}
+        else:
+            # Validate extracted data
+            validation_report = self.validate_extracted_data(extracted_data)
         
         # Calculate processing time
         processing_time = (datetime.utcnow() - start_time).total_seconds()
@@ -266,6 +544,114 @@ class AIProcessor:
             "timestamp": datetime.utcnow().isoformat()
         }
 
+    async def _chat_completion_async(self, messages: List[Dict], temperature: float, max_tokens: int) -> Dict:
+        """
+        Run a chat completion on the async client and parse the JSON response.
+
+        Returns:
+            Parsed response dictionary (or {"raw_response": ...} if not JSON)
+        """
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"}
+        )
+
+        result = response.choices[0].message.content
+
+        try:
+            return json.loads(result)
+        except json.JSONDecodeError:
+            return {"raw_response": result}
+
+    async def process_documents_async(self, paths_and_types: List[Tuple[str, str]], max_concurrency: int = 50) -> List[Dict]:
+        """
+        Process many documents concurrently.
+
+        Text extraction runs in a thread executor so the event loop stays
+        free; OpenAI calls go through the async client, with a semaphore
+        bounding in-flight requests for rate-limit control.
+
+        Args:
+            paths_and_types: List of (file_path, file_type) tuples
+            max_concurrency: Maximum number of documents processed at once
+
+        Returns:
+            List of processing results in input order
+        """
+        if not self.async_client:
+            logger.error("OpenAI client not initialized")
+            return [{"error": "AI service not available"} for _ in paths_and_types]
+
+        sem = asyncio.Semaphore(max_concurrency)
+        loop = asyncio.get_running_loop()
+
+        async def process(file_path: str, file_type: str) -> Dict:
+            async with sem:
+                start_time = datetime.utcnow()
+
+                if file_type.lower() == 'pdf':
+                    text, page_count = await loop.run_in_executor(
+                        None, self._extract_pdf_text, file_path
+                    )
+                elif file_type.lower() in ['png', 'jpg', 'jpeg']:
+                    text = await loop.run_in_executor(
+                        None, self.extract_text_from_image, file_path
+                    )
+                    page_count = 1
+                else:
+                    return {"error": f"Unsupported file type: {file_type}"}
+
+                if not text:
+                    return {"error": "No text could be extracted from document"}
+
+                try:
+                    extracted_data = await self._chat_completion_async(
+                        messages=[
+                            {"role": "system", "content": self.system_prompt},
+                            {"role": "user", "content": self._extraction_tmpl.format(text=text[:3000])}
+                        ],
+                        temperature=self.extraction_temperature,
+                        max_tokens=self.max_tokens
+                    )
+
+                    if "raw_response" in extracted_data:
+                        validation_report = {"skipped": "extraction_unparseable"}
+                    else:
+                        payload = json.dumps(extracted_data, separators=(",", ":"))[:self.max_validation_input_chars]
+
+                        validation_report = await self._chat_completion_async(
+                            messages=[
+                                {"role": "system", "content": "You are a claim validation expert. Respond with a JSON object."},
+                                {"role": "user", "content": self._validation_tmpl.format(data=payload)}
+                            ],
+                            temperature=0.3,
+                            max_tokens=2000
+                        )
+                except Exception as e:
+                    logger.error(f"Error processing document {file_path}: {e}")
+                    return {"error": str(e)}
+
+                processing_time = (datetime.utcnow() - start_time).total_seconds()
+
+                return {
+                    "extracted_text": text[:500],  # First 500 chars
+                    "page_count": page_count,
+                    "extracted_data": extracted_data,
+                    "validation_report": validation_report,
+                    "processing_time": processing_time,
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+
+        logger.info(f"Processing batch of {len(paths_and_types)} documents "
+                    f"(max_concurrency={max_concurrency})")
+
+        return await asyncio.gather(
+            *(process(path, file_type) for path, file_type in paths_and_types)
+        )
+
 
 # Export
 __all__ = ["AIProcessor"]
@@ -1,6 +1,7 @@
 # config.py - Configuration Management for SmartFormsGPT
 
 import os
+import functools
 from typing import Optional
 from dotenv import load_dotenv
 from pydantic import BaseSettings, validator
@@ -121,15 +122,19 @@ class TestSettings(Settings):
     ENABLE_AI_PROCESSING: bool = False  # Disable AI in tests
 
 
+@functools.lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get settings based on environment.
-    
+
+    Cached so per-request callers (e.g. dependency injection) don't
+    re-run Pydantic validation and env parsing every time.
+
     Returns:
         Settings instance for current environment
     """
     env = os.getenv("ENVIRONMENT", "development").lower()
-    
+
     if env == "production":
         return ProductionSettings()
     elif env == "test":
@@ -138,8 +143,11 @@ def get_settings() -> Settings:
         return DevelopmentSettings()
 
 
-# Global settings instance
-settings = get_settings()
+def __getattr__(name):
+    """Lazily build the global settings instance on first access."""
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Export
 __all__ = ["settings", "Settings", "get_settings"]
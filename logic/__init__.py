@@ -6,8 +6,10 @@ This package contains business logic and decision-making components.
 
 from logic.decision_engine import DecisionEngine
 from logic.rules import ClaimRules
+from logic.llm_cache import LLMCache
 
 __all__ = [
     "DecisionEngine",
-    "ClaimRules"
+    "ClaimRules",
+    "LLMCache"
 ]
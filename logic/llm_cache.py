@@ -0,0 +1,161 @@
+# llm_cache.py - Exact-Match LLM Response Cache
+
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from logger import get_logger
+
+try:
+    from diskcache import Cache
+except ImportError:  # pragma: no cover - diskcache is in requirements
+    Cache = None
+
+logger = get_logger(__name__)
+
+# Default time-to-live for cached responses (7 days)
+DEFAULT_TTL_SECONDS = 7 * 86400
+
+# Default bound on the semantic cache index (entries, not bytes)
+DEFAULT_SEMANTIC_MAX_ENTRIES = 512
+
+class LLMCache:
+    """Exact-match cache for LLM responses keyed by request content hash."""
+
+    def __init__(self, directory: str = "cache/llm", ttl: int = DEFAULT_TTL_SECONDS):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        if Cache is not None:
+            self._cache = Cache(directory)
+        else:
+            logger.warning("diskcache not available, using in-memory LLM cache")
+            self._cache = {}
+
+    def cache_key(self, model: str, messages: List[Dict], temperature: float) -> Optional[str]:
+        """
+        Build a deterministic cache key for a chat completion request.
+
+        Returns:
+            SHA-256 hex digest, or None if the request should not be cached
+            (high temperature means responses are too creative to reuse)
+        """
+        if temperature > 0.5:
+            return None
+
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[Dict]:
+        """Look up a cached response, tracking hit/miss counters."""
+        if key is None:
+            return None
+
+        cached = self._cache.get(key)
+
+        if cached is not None:
+            self.hits += 1
+            logger.info(f"LLM cache hit ({self.hits} hits / {self.misses} misses)")
+        else:
+            self.misses += 1
+            logger.debug(f"LLM cache miss ({self.hits} hits / {self.misses} misses)")
+
+        return cached
+
+    def set(self, key: Optional[str], value: Dict) -> None:
+        """Store a response under the given key."""
+        if key is None:
+            return
+
+        if Cache is not None:
+            self._cache.set(key, value, expire=self.ttl)
+        else:
+            self._cache[key] = value
+
+class SemanticLLMCache:
+    """
+    Embedding-similarity cache for near-duplicate document text.
+
+    Catches inputs that differ only by whitespace, OCR noise or minor
+    field values, which an exact-hash cache misses. Entries are matched
+    by cosine similarity of OpenAI embeddings against a flat in-memory
+    index, bounded to max_entries (oldest evicted first). Share one
+    instance per process — a fresh index can never hit.
+    """
+
+    def __init__(self, client, embedding_model: str = "text-embedding-3-small",
+                 threshold: float = 0.92,
+                 max_entries: int = DEFAULT_SEMANTIC_MAX_ENTRIES):
+        self.client = client
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._embeddings: List[np.ndarray] = []
+        self._responses: List[Dict] = []
+
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed text into a unit-normalized vector, or None on failure."""
+        try:
+            response = self.client.embeddings.create(
+                model=self.embedding_model,
+                input=text
+            )
+            vec = np.asarray(response.data[0].embedding, dtype=np.float32)
+            return vec / np.linalg.norm(vec)
+        except Exception as e:
+            logger.error(f"Error embedding text for semantic cache: {e}")
+            return None
+
+    def get(self, text: str) -> Tuple[Optional[Dict], Optional[np.ndarray]]:
+        """
+        Look up the nearest cached entry for the given text.
+
+        Returns:
+            Tuple of (cached_response_or_None, embedding) — the embedding
+            is returned so a subsequent set() does not re-embed
+        """
+        embedding = self.embed(text)
+        if embedding is None or not self._embeddings:
+            if embedding is not None:
+                self.misses += 1
+            return None, embedding
+
+        # Unit vectors: dot product is cosine similarity
+        similarities = np.stack(self._embeddings) @ embedding
+        best = int(np.argmax(similarities))
+
+        if similarities[best] >= self.threshold:
+            self.hits += 1
+            logger.info(f"Semantic cache hit (cosine={similarities[best]:.3f}, "
+                        f"{self.hits} hits / {self.misses} misses)")
+            return self._responses[best], embedding
+
+        self.misses += 1
+        return None, embedding
+
+    def set(self, embedding: Optional[np.ndarray], response: Dict) -> None:
+        """Store a response under its precomputed embedding."""
+        if embedding is None:
+            return
+
+        # Evict oldest first so the index stays bounded in a
+        # long-lived process
+        if len(self._embeddings) >= self.max_entries:
+            self._embeddings.pop(0)
+            self._responses.pop(0)
+
+        self._embeddings.append(embedding)
+        self._responses.append(response)
+
+# Export
+__all__ = ["LLMCache", "SemanticLLMCache"]
@@ -2,6 +2,7 @@
 
 from datetime import datetime, timedelta
 from typing import List
+import numpy as np
 from schemas.base_claim import BaseClaim
 from logger import get_logger
 
@@ -60,33 +61,111 @@ class ClaimRules:
         """
         Validate service date is within acceptable range.
         """
-        now = datetime.utcnow()
-        max_age = now - timedelta(days=self.MAX_SERVICE_AGE_DAYS)
-        
+        service_date = claim.service_date
+        if isinstance(service_date, datetime):
+            # Trusted construct() paths may still carry datetimes
+            service_date = service_date.date()
+
+        # UTC, matching the vectorized check_service_dates — local time
+        # would let single and batch evaluation disagree near midnight
+        today = datetime.utcnow().date()
+        max_age = today - timedelta(days=self.MAX_SERVICE_AGE_DAYS)
+
         # Service date cannot be in the future
-        if claim.service_date > now:
+        if service_date > today:
             logger.warning(f"Claim {claim.claim_id} has future service date")
             return False
-        
+
         # Service date cannot be too old
-        if claim.service_date < max_age:
+        if service_date < max_age:
             logger.warning(f"Claim {claim.claim_id} service date too old")
             return False
-        
+
         return True
+
+    def check_service_dates(self, service_dates: np.ndarray) -> np.ndarray:
+        """
+        Vectorized check_service_date for a batch of claims.
+
+        Bounds are computed once and compared in a single NumPy mask op
+        instead of per-claim datetime constructions and comparisons.
+
+        Returns:
+            Boolean array, True where the service date is acceptable
+        """
+        service_dates = np.asarray(service_dates, dtype="datetime64[us]")
+        now = np.datetime64(datetime.utcnow(), "us")
+        max_age = now - np.timedelta64(self.MAX_SERVICE_AGE_DAYS, "D")
+
+        return (service_dates <= now) & (service_dates >= max_age)
     
-    def check_duplicate(self, claim: BaseClaim) -> bool:
+    @staticmethod
+    def _dedup_key(claim: BaseClaim) -> str:
+        """Build the unique dedup key for a claim."""
+        service_date = claim.service_date
+        if isinstance(service_date, datetime):
+            service_date = service_date.date()
+        return f"{claim.patient_id}|{service_date}|{claim.total_amount}"
+
+    def record_claim(self, claim: BaseClaim, db=None) -> None:
+        """
+        Record a claim's dedup key so later submissions are flagged.
+
+        Use together with check_duplicate(record=False) when the check
+        and the recording need to happen at different pipeline stages.
+        """
+        claim_key = self._dedup_key(claim)
+        self.processed_claims.add(claim_key)
+
+        if db is not None:
+            from models import DedupKey
+
+            try:
+                db.add(DedupKey(key=claim_key, claim_id=claim.claim_id))
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Dedup key insert conflict for {claim_key}: {e}")
+
+    def check_duplicate(self, claim: BaseClaim, db=None, record: bool = True) -> bool:
         """
         Check if claim might be a duplicate.
+
+        With a database session, keys are checked against the indexed
+        claim_dedup_keys table so detection survives restarts and is
+        shared across workers; the in-memory set stays in front as a
+        hot-path cache (and as the fallback when no session is given).
+        Pass record=False for a side-effect-free check.
         """
-        # Create a unique key for the claim
-        claim_key = f"{claim.patient_id}_{claim.service_date.date()}_{claim.total_amount}"
-        
+        claim_key = self._dedup_key(claim)
+
         if claim_key in self.processed_claims:
             logger.warning(f"Potential duplicate claim detected: {claim_key}")
             return True
-        
-        self.processed_claims.add(claim_key)
+
+        if db is not None:
+            # Imported here so the no-DB path keeps logic free of a
+            # hard dependency on the ORM layer
+            from models import DedupKey
+
+            if db.query(DedupKey).filter(DedupKey.key == claim_key).first() is not None:
+                self.processed_claims.add(claim_key)
+                logger.warning(f"Potential duplicate claim detected: {claim_key}")
+                return True
+
+            if record:
+                try:
+                    db.add(DedupKey(key=claim_key, claim_id=claim.claim_id))
+                    db.commit()
+                except Exception as e:
+                    # Concurrent insert of the same key counts as a duplicate
+                    db.rollback()
+                    logger.warning(f"Dedup key insert conflict for {claim_key}: {e}")
+                    self.processed_claims.add(claim_key)
+                    return True
+
+        if record:
+            self.processed_claims.add(claim_key)
         return False
     
     def check_documentation(self, claim: BaseClaim) -> float:
@@ -121,7 +200,7 @@ class ClaimRules:
             score += 0.5
         
         normalized_score = score / max_score
-        logger.info(f"Documentation score for claim {claim.claim_id}: {normalized_score:.2f}")
+        logger.debug(f"Documentation score for claim {claim.claim_id}: {normalized_score:.2f}")
         
         return normalized_score
     
@@ -96,6 +96,16 @@ class Document(Base):
     claim = relationship("Claim", back_populates="documents")
 
 
+class DedupKey(Base):
+    """Dedup key model for cross-worker duplicate detection."""
+
+    __tablename__ = "claim_dedup_keys"
+
+    key = Column(String(100), primary_key=True)
+    claim_id = Column(String(50))
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class ClaimHistory(Base):
     """Claim history model for audit trail."""
     
@@ -119,4 +129,4 @@ class ClaimHistory(Base):
 
 
 # Export all models
-__all__ = ["User", "Claim", "Document", "ClaimHistory"]
+__all__ = ["User", "Claim", "Document", "DedupKey", "ClaimHistory"]
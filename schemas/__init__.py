@@ -2,31 +2,47 @@
 Schemas package for SmartFormsGPT.
 
 This package contains Pydantic schemas for claim data validation.
+
+Exports are resolved lazily (PEP 562) so importing the package does
+not pay the schema build cost of every model up front — each model
+module is imported on first attribute access and cached.
 """
 
-from schemas.base_claim import (
-    BaseClaim,
-    ClaimStatus,
-    ClaimType,
-    ClaimResponse
-)
-
-from schemas.custom_claim import (
-    MedicalClaim,
-    DentalClaim,
-    PrescriptionClaim,
-    FormExtraction
-)
-
-__all__ = [
+import importlib
+
+# Export name -> defining module
+_EXPORTS = {
     # Base schemas
-    "BaseClaim",
-    "ClaimStatus",
-    "ClaimType",
-    "ClaimResponse",
+    "BaseClaim": "schemas.base_claim",
+    "ClaimStatus": "schemas.base_claim",
+    "ClaimType": "schemas.base_claim",
+    "ClaimResponse": "schemas.base_claim",
+    "STATUS_CODES": "schemas.base_claim",
+    "CLAIM_TYPE_CODES": "schemas.base_claim",
     # Custom schemas
-    "MedicalClaim",
-    "DentalClaim",
-    "PrescriptionClaim",
-    "FormExtraction"
-]
+    "MedicalClaim": "schemas.custom_claim",
+    "DentalClaim": "schemas.custom_claim",
+    "PrescriptionClaim": "schemas.custom_claim",
+    "FormExtraction": "schemas.custom_claim",
+    # Factory
+    "build_claim": "schemas.factory",
+    "CLAIM_CLASSES": "schemas.factory",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Resolve exported names on first access and cache them."""
+    try:
+        module_name = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(__all__)
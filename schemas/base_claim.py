@@ -1,8 +1,9 @@
 # base_claim.py - Base Claim Schema
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
-from pydantic import BaseModel, Field, validator
+import msgspec
+from pydantic import BaseModel, Field
 from enum import Enum
 
 class ClaimStatus(str, Enum):
@@ -23,6 +24,13 @@ class ClaimType(str, Enum):
     HOSPITAL = "hospital"
     OTHER = "other"
 
+# Dense integer codes for array-based aggregation (np.uint8 columns,
+# bincount). The enums stay str-based so serialized values keep their
+# string form; these parallel maps unlock the integer pathway, and the
+# str-enum keys mean lookups also work with plain string values.
+STATUS_CODES = {status: code for code, status in enumerate(ClaimStatus)}
+CLAIM_TYPE_CODES = {claim_type: code for code, claim_type in enumerate(ClaimType)}
+
 class BaseClaim(BaseModel):
     """Base claim schema with common fields."""
     
@@ -33,56 +41,53 @@ class BaseClaim(BaseModel):
     # Patient Information
     patient_name: str = Field(..., min_length=1, max_length=200, description="Patient full name")
     patient_id: str = Field(..., description="Patient ID or member number")
-    date_of_birth: datetime = Field(..., description="Patient date of birth")
-    
+    date_of_birth: date = Field(..., description="Patient date of birth")
+
     # Claim Details
-    service_date: datetime = Field(..., description="Date of service")
+    service_date: date = Field(..., description="Date of service")
     provider_name: str = Field(..., description="Healthcare provider name")
     provider_id: Optional[str] = Field(None, description="Provider ID or NPI")
     
     # Financial
-    total_amount: float = Field(..., gt=0, description="Total claim amount")
+    total_amount: float = Field(..., gt=0, le=1000000, description="Total claim amount")
     currency: str = Field(default="USD", description="Currency code")
     
     # Documentation
     description: Optional[str] = Field(None, max_length=1000, description="Claim description")
-    diagnosis_codes: Optional[List[str]] = Field(default=[], description="ICD-10 diagnosis codes")
-    procedure_codes: Optional[List[str]] = Field(default=[], description="CPT procedure codes")
+    diagnosis_codes: Optional[List[str]] = Field(default_factory=list, description="ICD-10 diagnosis codes")
+    procedure_codes: Optional[List[str]] = Field(default_factory=list, description="CPT procedure codes")
     
     # Metadata
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     submitted_at: Optional[datetime] = None
-    
-    @validator('total_amount')
-    def validate_amount(cls, v):
-        """Validate claim amount is positive and reasonable."""
-        if v <= 0:
-            raise ValueError('Claim amount must be positive')
-        if v > 1000000:  # $1M limit
-            raise ValueError('Claim amount exceeds maximum limit')
-        return round(v, 2)
-    
-    @validator('service_date')
-    def validate_service_date(cls, v):
-        """Validate service date is not in the future."""
-        if v > datetime.utcnow():
-            raise ValueError('Service date cannot be in the future')
-        return v
-    
+
+    # Amount bounds are encoded in the Field (gt/le) instead of a
+    # custom validator; the not-in-the-future rule lives only in
+    # ClaimRules.check_service_date, and rounding happens at display
+    # time in format_currency
+
     class Config:
+        # Claims are value objects after construction: no __setattr__
+        # validation guard, no unknown-field collection
+        allow_mutation = False
+        extra = "forbid"
         use_enum_values = True
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
 
-class ClaimResponse(BaseModel):
-    """Response schema for claim operations."""
-    
+class ClaimResponse(msgspec.Struct, frozen=True):
+    """
+    Response for claim operations.
+
+    A transient DTO with no validation needs, so it is a slotted
+    msgspec Struct rather than a Pydantic model: no per-instance
+    __dict__, and it works on Python 3.9 where dataclass slots=True
+    is not available.
+    """
+
     success: bool
     message: str
     claim_id: Optional[str] = None
     status: Optional[ClaimStatus] = None
-    
-    class Config:
-        use_enum_values = True
@@ -0,0 +1,144 @@
+# base_claim_fast.py - msgspec Claim Structs for Hot Paths
+
+from datetime import date, datetime
+from typing import Optional, List
+
+import msgspec
+
+from schemas.base_claim import ClaimStatus, ClaimType
+
+class BaseClaim(msgspec.Struct, kw_only=True):
+    """
+    msgspec mirror of schemas.base_claim.BaseClaim for tight loops.
+
+    Field names and types are identical to the Pydantic model, so
+    decision-engine code works on either. Type checks happen in
+    msgspec's C layer; the cross-field invariants the Pydantic
+    validators enforce live in validate(), called explicitly only on
+    untrusted ingest paths.
+    """
+
+    claim_id: Optional[str] = None
+    claim_type: ClaimType
+    status: ClaimStatus = ClaimStatus.DRAFT
+
+    # Patient Information
+    patient_name: str
+    patient_id: str
+    date_of_birth: date
+
+    # Claim Details
+    service_date: date
+    provider_name: str
+    provider_id: Optional[str] = None
+
+    # Financial
+    total_amount: float
+    currency: str = "USD"
+
+    # Documentation
+    description: Optional[str] = None
+    diagnosis_codes: List[str] = []
+    procedure_codes: List[str] = []
+
+    # Metadata
+    created_at: datetime = msgspec.field(default_factory=datetime.utcnow)
+    updated_at: datetime = msgspec.field(default_factory=datetime.utcnow)
+    submitted_at: Optional[datetime] = None
+
+    def validate(self) -> "BaseClaim":
+        """Run the invariant checks the Pydantic validators enforce."""
+        if self.total_amount <= 0:
+            raise ValueError('Claim amount must be positive')
+        if self.total_amount > 1000000:  # $1M limit
+            raise ValueError('Claim amount exceeds maximum limit')
+        if self.service_date > date.today():
+            raise ValueError('Service date cannot be in the future')
+        return self
+
+
+class MedicalClaim(BaseClaim, kw_only=True):
+    """msgspec mirror of schemas.custom_claim.MedicalClaim."""
+
+    claim_type: ClaimType = ClaimType.MEDICAL
+
+    # Medical-specific fields
+    admission_date: Optional[datetime] = None
+    discharge_date: Optional[datetime] = None
+    room_type: Optional[str] = None
+    attending_physician: Optional[str] = None
+
+    # Treatment details
+    treatment_type: Optional[str] = None
+    medications: List[str] = []
+    lab_tests: List[str] = []
+
+    def validate(self) -> "MedicalClaim":
+        super().validate()
+        if self.discharge_date and self.admission_date:
+            if self.discharge_date < self.admission_date:
+                raise ValueError('Discharge date must be after admission date')
+        return self
+
+
+class DentalClaim(BaseClaim, kw_only=True):
+    """msgspec mirror of schemas.custom_claim.DentalClaim."""
+
+    claim_type: ClaimType = ClaimType.DENTAL
+
+    # Dental-specific fields
+    tooth_number: Optional[str] = None
+    procedure_type: Optional[str] = None
+    is_emergency: bool = False
+    x_rays_taken: bool = False
+
+
+class PrescriptionClaim(BaseClaim, kw_only=True):
+    """msgspec mirror of schemas.custom_claim.PrescriptionClaim."""
+
+    claim_type: ClaimType = ClaimType.PRESCRIPTION
+
+    # Prescription-specific fields
+    medication_name: str
+    dosage: str
+    quantity: int
+    days_supply: int
+    pharmacy_name: str
+    pharmacy_npi: Optional[str] = None
+    is_generic: bool = False
+    refill_number: int = 0
+
+    def validate(self) -> "PrescriptionClaim":
+        super().validate()
+        if self.quantity <= 0:
+            raise ValueError('Quantity must be positive')
+        if self.days_supply <= 0:
+            raise ValueError('Days supply must be positive')
+        return self
+
+
+class ClaimResponse(msgspec.Struct, kw_only=True):
+    """msgspec mirror of schemas.base_claim.ClaimResponse."""
+
+    success: bool
+    message: str
+    claim_id: Optional[str] = None
+    status: Optional[ClaimStatus] = None
+
+
+# Reusable decoder: msgspec precompiles the type tree once
+_claim_decoder = msgspec.json.Decoder(BaseClaim)
+
+def decode_claim(data: bytes) -> BaseClaim:
+    """Decode and type-check a JSON claim in one msgspec pass."""
+    return _claim_decoder.decode(data)
+
+# Export
+__all__ = [
+    "BaseClaim",
+    "MedicalClaim",
+    "DentalClaim",
+    "PrescriptionClaim",
+    "ClaimResponse",
+    "decode_claim"
+]
@@ -18,8 +18,8 @@ class MedicalClaim(BaseClaim):
     
     # Treatment details
     treatment_type: Optional[str] = Field(None, description="Type of treatment")
-    medications: Optional[List[str]] = Field(default=[], description="Medications prescribed")
-    lab_tests: Optional[List[str]] = Field(default=[], description="Laboratory tests performed")
+    medications: Optional[List[str]] = Field(default_factory=list, description="Medications prescribed")
+    lab_tests: Optional[List[str]] = Field(default_factory=list, description="Laboratory tests performed")
     
     @validator('discharge_date')
     def validate_discharge(cls, v, values):
@@ -60,9 +60,9 @@ class FormExtraction(BaseClaim):
     
     # Extraction metadata
     extraction_confidence: float = Field(..., ge=0, le=1, description="AI confidence score")
-    extracted_fields: Dict[str, Any] = Field(default={}, description="Extracted field values")
-    missing_fields: List[str] = Field(default=[], description="Fields not found in form")
-    validation_errors: List[str] = Field(default=[], description="Validation errors found")
+    extracted_fields: Dict[str, Any] = Field(default_factory=dict, description="Extracted field values")
+    missing_fields: List[str] = Field(default_factory=list, description="Fields not found in form")
+    validation_errors: List[str] = Field(default_factory=list, description="Validation errors found")
     
     # Document info
     document_type: str = Field(..., description="Type of document processed")
@@ -2,11 +2,15 @@
 
 import streamlit as st
 import os
+import re
+import numpy as np
+import pandas as pd
+from collections import deque
 from datetime import datetime
 from dotenv import load_dotenv
 from logger import get_logger
-from schemas.base_claim import BaseClaim, ClaimStatus, ClaimType
-from schemas.custom_claim import MedicalClaim, DentalClaim, PrescriptionClaim
+from schemas.base_claim import BaseClaim, ClaimStatus, ClaimType, STATUS_CODES
+from schemas.factory import build_claim, CLAIM_CLASSES
 from logic.decision_engine import DecisionEngine
 from utils.helpers import generate_claim_id, format_currency
 from utils.validators import ClaimValidator
@@ -25,11 +29,49 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize session state
+# Display strings precomputed once; str-enum keys mean lookups work
+# whether the stored value is the enum member or its plain string
+_STATUS_DISPLAY = {status: status.value.upper() for status in ClaimStatus}
+_TYPE_DISPLAY = {claim_type: claim_type.value for claim_type in ClaimType}
+
+# Comma splitting with surrounding whitespace handled in one re pass
+_CODE_SPLIT = re.compile(r"\s*,\s*")
+
+def parse_codes(s) -> list:
+    """Split a comma-separated code string into a clean list."""
+    if not s:
+        return []
+    return [c for c in _CODE_SPLIT.split(s.strip()) if c]
+
+# Bound on live session claims so long-running sessions don't grow
+# memory without limit; oldest claims fall off first
+MAX_SESSION_CLAIMS = int(os.getenv("MAX_SESSION_CLAIMS", 1000))
+
+# Initialize session state (claims plus parallel SoA columns for
+# analytics; appends happen together so the deques stay aligned)
 if 'claims' not in st.session_state:
-    st.session_state.claims = []
-if 'decision_engine' not in st.session_state:
-    st.session_state.decision_engine = DecisionEngine()
+    st.session_state.claims = deque(maxlen=MAX_SESSION_CLAIMS)
+if 'claim_amounts' not in st.session_state:
+    st.session_state.claim_amounts = deque(maxlen=MAX_SESSION_CLAIMS)
+if 'claim_status_codes' not in st.session_state:
+    st.session_state.claim_status_codes = deque(maxlen=MAX_SESSION_CLAIMS)
+
+@st.cache_resource
+def get_decision_engine() -> DecisionEngine:
+    """Share one DecisionEngine (and its rules) across reruns and sessions."""
+    return DecisionEngine()
+
+def _append_claim(claim):
+    """
+    Store a claim plus its analytics columns (amount, status code).
+
+    Claims are kept as plain dicts: the session only reads display
+    fields, so holding Pydantic instances would just cost memory.
+    Reconstruct with BaseClaim.construct(**d) if a model is needed.
+    """
+    st.session_state.claims.append(claim.dict())
+    st.session_state.claim_amounts.append(claim.total_amount)
+    st.session_state.claim_status_codes.append(STATUS_CODES[ClaimStatus(claim.status)])
 
 def main():
     """Main application function."""
@@ -118,42 +160,36 @@ def submit_claim_page():
                 "claim_type": claim_type.lower(),
                 "patient_name": patient_name,
                 "patient_id": patient_id,
-                "date_of_birth": datetime.combine(dob, datetime.min.time()),
+                "date_of_birth": dob,
                 "provider_name": provider_name,
                 "provider_id": provider_id if provider_id else None,
-                "service_date": datetime.combine(service_date, datetime.min.time()),
+                "service_date": service_date,
                 "total_amount": total_amount,
                 "description": description if description else None,
-                "diagnosis_codes": [c.strip() for c in diagnosis_codes.split(',')] if diagnosis_codes else [],
-                "procedure_codes": [c.strip() for c in procedure_codes.split(',')] if procedure_codes else []
+                "diagnosis_codes": parse_codes(diagnosis_codes),
+                "procedure_codes": parse_codes(procedure_codes)
             }
             
             # Generate claim ID
             claim_id = generate_claim_id(patient_id, claim_data["service_date"])
             claim_data["claim_id"] = claim_id
             
-            # Create claim based on type
-            if claim_type.lower() == "medical":
-                claim = MedicalClaim(**claim_data)
-            elif claim_type.lower() == "dental":
-                claim = DentalClaim(**claim_data)
-            elif claim_type.lower() == "prescription":
-                claim = PrescriptionClaim(**claim_data)
-            else:
-                claim = BaseClaim(**claim_data)
+            # Create claim based on type; the form already range-checked
+            # the inputs, so the factory skips full model validation
+            claim = build_claim(claim_type, claim_data)
             
             # Evaluate claim
-            status, reasons, confidence = st.session_state.decision_engine.evaluate_claim(claim)
-            claim.status = status
+            status, reasons, confidence = get_decision_engine().evaluate_claim(claim)
+            claim = claim.copy(update={"status": status})
             
             # Add to session state
-            st.session_state.claims.append(claim)
+            _append_claim(claim)
             
             # Display result
             st.success(f"✅ Claim submitted successfully! Claim ID: {claim_id}")
             
             # Show decision
-            st.info(f"**Status:** {status.value.upper()}")
+            st.info(f"**Status:** {_STATUS_DISPLAY[status]}")
             st.info(f"**Confidence:** {confidence:.1%}")
             
             with st.expander("Decision Details"):
@@ -175,41 +211,99 @@ def view_claims_page():
         st.info("No claims submitted yet.")
         return
     
-    # Display claims in a table
+    # Display claims in a table (stored as plain dicts)
     for claim in reversed(st.session_state.claims):  # Show newest first
-        with st.expander(f"Claim {claim.claim_id} - {claim.status.value.upper()}"):
+        with st.expander(f"Claim {claim['claim_id']} - {_STATUS_DISPLAY[claim['status']]}"):
             col1, col2, col3 = st.columns(3)
-            
+
             with col1:
-                st.write("**Patient:**", claim.patient_name)
-                st.write("**Patient ID:**", claim.patient_id)
-                st.write("**Type:**", claim.claim_type.value)
-            
+                st.write("**Patient:**", claim["patient_name"])
+                st.write("**Patient ID:**", claim["patient_id"])
+                st.write("**Type:**", _TYPE_DISPLAY[claim["claim_type"]])
+
             with col2:
-                st.write("**Provider:**", claim.provider_name)
-                st.write("**Service Date:**", claim.service_date.strftime("%Y-%m-%d"))
-                st.write("**Amount:**", format_currency(claim.total_amount))
-            
+                st.write("**Provider:**", claim["provider_name"])
+                st.write("**Service Date:**", claim["service_date"].strftime("%Y-%m-%d"))
+                st.write("**Amount:**", format_currency(claim["total_amount"]))
+
             with col3:
-                st.write("**Status:**", claim.status.value.upper())
-                st.write("**Created:**", claim.created_at.strftime("%Y-%m-%d %H:%M"))
-            
-            if claim.description:
-                st.write("**Description:**", claim.description)
+                st.write("**Status:**", _STATUS_DISPLAY[claim["status"]])
+                st.write("**Created:**", claim["created_at"].strftime("%Y-%m-%d %H:%M"))
+
+            if claim["description"]:
+                st.write("**Description:**", claim["description"])
+
+def _claims_from_dataframe(df: pd.DataFrame) -> list:
+    """
+    Build claims from a parsed upload.
+
+    The file was already parsed and typed by pandas' C reader, so rows
+    are treated as trusted data and constructed without re-running the
+    Pydantic validator chain per row.
+    """
+    df = df.where(df.notna(), None)
+    columns = df.columns.tolist()
+
+    claims = []
+    for row in df.itertuples(index=False, name=None):
+        data = dict(zip(columns, row))
+        for field in ("diagnosis_codes", "procedure_codes"):
+            if isinstance(data.get(field), str):
+                data[field] = parse_codes(data[field])
+        if not data.get("claim_id"):
+            data["claim_id"] = generate_claim_id(str(data.get("patient_id", "")), data.get("service_date") or datetime.utcnow())
+        claim_cls = CLAIM_CLASSES.get(str(data.get("claim_type", "")).lower(), BaseClaim)
+        claims.append(claim_cls.construct(**data))
+
+    return claims
 
 def batch_processing_page():
     """Page for batch claim processing."""
-    
+
     st.header("Batch Processing")
-    st.info("Upload multiple claims for batch processing (Coming Soon)")
-    
+    st.info("Upload a CSV or Excel file with one claim per row.")
+
     uploaded_file = st.file_uploader(
         "Upload CSV or Excel file with claims",
         type=['csv', 'xlsx']
     )
-    
+
     if uploaded_file:
-        st.warning("Batch processing feature is under development.")
+        try:
+            date_columns = ["service_date", "date_of_birth"]
+            if uploaded_file.name.endswith(".csv"):
+                df = pd.read_csv(uploaded_file, parse_dates=date_columns)
+            else:
+                df = pd.read_excel(uploaded_file, parse_dates=date_columns)
+
+            # The schema stores plain dates; drop the time component
+            for col in date_columns:
+                if col in df.columns:
+                    df[col] = df[col].dt.date
+
+            claims = _claims_from_dataframe(df)
+            results = get_decision_engine().process_batch(claims)
+
+            for claim, detail in zip(claims, results["details"]):
+                _append_claim(claim.copy(update={"status": detail["status"]}))
+
+            st.success(f"✅ Processed {results['total']} claims")
+
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Approved", results["approved"])
+            with col2:
+                st.metric("Rejected", results["rejected"])
+            with col3:
+                st.metric("Under Review", results["under_review"])
+            with col4:
+                st.metric("Pending Info", results["pending_info"])
+
+            logger.info(f"Batch upload {uploaded_file.name} processed: {results['total']} claims")
+
+        except Exception as e:
+            st.error(f"Error processing file: {str(e)}")
+            logger.error(f"Error processing batch upload: {e}")
 
 def analytics_page():
     """Page for analytics and reporting."""
@@ -220,14 +314,21 @@ def analytics_page():
         st.info("No data available for analytics.")
         return
     
-    # Calculate statistics
+    # Calculate statistics from the SoA columns: contiguous NumPy
+    # reductions instead of per-object attribute lookups
     total_claims = len(st.session_state.claims)
-    total_amount = sum(c.total_amount for c in st.session_state.claims)
-    
-    status_counts = {}
-    for claim in st.session_state.claims:
-        status = claim.status.value
-        status_counts[status] = status_counts.get(status, 0) + 1
+
+    amounts = np.asarray(st.session_state.claim_amounts, dtype=np.float64)
+    status_codes = np.asarray(st.session_state.claim_status_codes, dtype=np.uint8)
+
+    total_amount = float(amounts.sum())
+
+    counts = np.bincount(status_codes, minlength=len(ClaimStatus))
+    status_counts = {
+        status.value: int(count)
+        for status, count in zip(ClaimStatus, counts)
+        if count
+    }
     
     # Display metrics
     col1, col2, col3, col4 = st.columns(4)
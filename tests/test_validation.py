@@ -6,153 +6,151 @@ from utils.validators import ClaimValidator, ValidationError
 
 class TestPatientIDValidation:
     """Test patient ID validation."""
-    
-    def test_valid_patient_id(self):
+
+    @pytest.mark.parametrize("patient_id", ["ABC123", "PAT-12345", "MEM-ABC-123", "123456789"])
+    def test_valid_patient_id(self, patient_id):
         """Test valid patient ID formats."""
-        valid_ids = ["ABC123", "PAT-12345", "MEM-ABC-123", "123456789"]
-        for patient_id in valid_ids:
-            is_valid, error = ClaimValidator.validate_patient_id(patient_id)
-            assert is_valid, f"Expected {patient_id} to be valid"
-            assert error is None
-    
-    def test_invalid_patient_id_too_short(self):
-        """Test patient ID that is too short."""
-        is_valid, error = ClaimValidator.validate_patient_id("ABC")
-        assert not is_valid
-        assert "between 6 and 20 characters" in error
-    
-    def test_invalid_patient_id_too_long(self):
-        """Test patient ID that is too long."""
-        is_valid, error = ClaimValidator.validate_patient_id("A" * 25)
-        assert not is_valid
-        assert "between 6 and 20 characters" in error
-    
-    def test_invalid_patient_id_empty(self):
-        """Test empty patient ID."""
-        is_valid, error = ClaimValidator.validate_patient_id("")
-        assert not is_valid
-        assert "cannot be empty" in error
-    
-    def test_invalid_patient_id_special_chars(self):
-        """Test patient ID with invalid special characters."""
-        is_valid, error = ClaimValidator.validate_patient_id("ABC@123")
+        is_valid, error = ClaimValidator.validate_patient_id(patient_id)
+        assert is_valid, f"Expected {patient_id} to be valid"
+        assert error is None
+
+    @pytest.mark.parametrize("patient_id,fragment", [
+        ("ABC", "between 6 and 20 characters"),
+        ("A" * 25, "between 6 and 20 characters"),
+        ("", "cannot be empty"),
+        ("ABC@123", "letters, numbers, and hyphens")
+    ])
+    def test_invalid_patient_id(self, patient_id, fragment):
+        """Test invalid patient IDs: too short, too long, empty, bad chars."""
+        is_valid, error = ClaimValidator.validate_patient_id(patient_id)
         assert not is_valid
-        assert "letters, numbers, and hyphens" in error
+        assert fragment in error
 
 
 class TestNPIValidation:
     """Test NPI (National Provider Identifier) validation."""
-    
+
     def test_valid_npi(self):
         """Test valid NPI number."""
         # Valid NPI with correct Luhn checksum
         is_valid, error = ClaimValidator.validate_provider_npi("1234567893")
         assert is_valid
         assert error is None
-    
+
     def test_npi_optional(self):
         """Test that NPI is optional."""
         is_valid, error = ClaimValidator.validate_provider_npi("")
         assert is_valid
         assert error is None
-    
-    def test_invalid_npi_length(self):
-        """Test NPI with incorrect length."""
-        is_valid, error = ClaimValidator.validate_provider_npi("123456")
-        assert not is_valid
-        assert "exactly 10 digits" in error
-    
-    def test_invalid_npi_checksum(self):
-        """Test NPI with invalid Luhn checksum."""
-        is_valid, error = ClaimValidator.validate_provider_npi("1234567890")
+
+    @pytest.mark.parametrize("npi,fragment", [
+        ("123456", "exactly 10 digits"),
+        ("1234567890", "Invalid NPI checksum")
+    ])
+    def test_invalid_npi(self, npi, fragment):
+        """Test NPIs with incorrect length or failing Luhn checksum."""
+        is_valid, error = ClaimValidator.validate_provider_npi(npi)
         assert not is_valid
-        assert "Invalid NPI checksum" in error
+        assert fragment in error
+
+    def test_luhn_batch_matches_scalar(self):
+        """Test batched Luhn agrees with the scalar check on both paths."""
+        npis = ["0000000018", "0000000019"]
+
+        # Small batch (scalar fallback) and large batch (NumPy kernel)
+        for batch in (npis, npis * 30):
+            results = ClaimValidator._luhn_check_batch(batch)
+            assert results.tolist() == [ClaimValidator._luhn_check(npi) for npi in batch]
 
 
 class TestDiagnosisCodeValidation:
     """Test ICD-10 diagnosis code validation."""
-    
-    def test_valid_diagnosis_codes(self):
+
+    @pytest.mark.parametrize("code", ["A00", "A00.1", "Z99.89", "M79.3"])
+    def test_valid_diagnosis_codes(self, code):
         """Test valid ICD-10 code formats."""
-        valid_codes = ["A00", "A00.1", "Z99.89", "M79.3"]
-        for code in valid_codes:
-            is_valid, error = ClaimValidator.validate_diagnosis_code(code)
-            assert is_valid, f"Expected {code} to be valid"
-            assert error is None
-    
-    def test_invalid_diagnosis_code_format(self):
+        is_valid, error = ClaimValidator.validate_diagnosis_code(code)
+        assert is_valid, f"Expected {code} to be valid"
+        assert error is None
+
+    @pytest.mark.parametrize("code", ["123", "ABC", "A", "A0", "AA00"])
+    def test_invalid_diagnosis_code_format(self, code):
         """Test invalid ICD-10 code formats."""
-        invalid_codes = ["123", "ABC", "A", "A0", "AA00"]
-        for code in invalid_codes:
-            is_valid, error = ClaimValidator.validate_diagnosis_code(code)
-            assert not is_valid, f"Expected {code} to be invalid"
-    
+        is_valid, error = ClaimValidator.validate_diagnosis_code(code)
+        assert not is_valid, f"Expected {code} to be invalid"
+
     def test_empty_diagnosis_code(self):
         """Test empty diagnosis code."""
         is_valid, error = ClaimValidator.validate_diagnosis_code("")
         assert not is_valid
         assert "cannot be empty" in error
 
+    def test_bulk_diagnosis_codes_match_scalar(self):
+        """Test bulk validation agrees with the scalar check on both paths."""
+        codes = ["A00.1", "123", "Z99.89", "AA00", "", "A00\nB01"]
+
+        # Small batch (scalar fallback) and large batch (joined regex)
+        for batch in (codes, codes * 30):
+            expected = [
+                (code, ClaimValidator.validate_diagnosis_code(code)[1])
+                for code in batch
+                if not ClaimValidator.validate_diagnosis_code(code)[0]
+            ]
+            assert ClaimValidator.validate_diagnosis_codes(batch) == expected
+
 
 class TestProcedureCodeValidation:
     """Test CPT procedure code validation."""
-    
-    def test_valid_procedure_codes(self):
+
+    @pytest.mark.parametrize("code", ["99213", "12345", "00100"])
+    def test_valid_procedure_codes(self, code):
         """Test valid CPT code formats."""
-        valid_codes = ["99213", "12345", "00100"]
-        for code in valid_codes:
-            is_valid, error = ClaimValidator.validate_procedure_code(code)
-            assert is_valid, f"Expected {code} to be valid"
-            assert error is None
-    
-    def test_invalid_procedure_code_length(self):
-        """Test CPT codes with incorrect length."""
-        invalid_codes = ["123", "1234", "123456"]
-        for code in invalid_codes:
-            is_valid, error = ClaimValidator.validate_procedure_code(code)
-            assert not is_valid
-            assert "exactly 5 digits" in error
-    
-    def test_invalid_procedure_code_letters(self):
-        """Test CPT code with letters."""
-        is_valid, error = ClaimValidator.validate_procedure_code("ABC12")
+        is_valid, error = ClaimValidator.validate_procedure_code(code)
+        assert is_valid, f"Expected {code} to be valid"
+        assert error is None
+
+    @pytest.mark.parametrize("code", ["123", "1234", "123456", "ABC12"])
+    def test_invalid_procedure_code(self, code):
+        """Test CPT codes with incorrect length or letters."""
+        is_valid, error = ClaimValidator.validate_procedure_code(code)
         assert not is_valid
         assert "exactly 5 digits" in error
 
+    def test_bulk_procedure_codes(self):
+        """Test bulk CPT validation flags only the invalid codes."""
+        codes = ["99213", "ABC12", "00100"] * 30
+        invalid = ClaimValidator.validate_procedure_codes(codes)
+
+        assert len(invalid) == 30
+        assert all(code == "ABC12" and "exactly 5 digits" in error
+                   for code, error in invalid)
+
 
 class TestAmountValidation:
     """Test claim amount validation."""
-    
-    def test_valid_amounts(self):
+
+    @pytest.mark.parametrize("amount", [0.01, 100.00, 1000.50, 50000.99])
+    def test_valid_amounts(self, amount):
         """Test valid claim amounts."""
-        valid_amounts = [0.01, 100.00, 1000.50, 50000.99]
-        for amount in valid_amounts:
-            is_valid, error = ClaimValidator.validate_amount(amount)
-            assert is_valid, f"Expected {amount} to be valid"
-            assert error is None
-    
-    def test_amount_too_low(self):
-        """Test amount below minimum."""
-        is_valid, error = ClaimValidator.validate_amount(0.00)
-        assert not is_valid
-        assert "at least" in error
-    
-    def test_amount_too_high(self):
-        """Test amount above maximum."""
-        is_valid, error = ClaimValidator.validate_amount(2000000.00)
-        assert not is_valid
-        assert "cannot exceed" in error
-    
-    def test_amount_too_many_decimals(self):
-        """Test amount with too many decimal places."""
-        is_valid, error = ClaimValidator.validate_amount(100.123)
+        is_valid, error = ClaimValidator.validate_amount(amount)
+        assert is_valid, f"Expected {amount} to be valid"
+        assert error is None
+
+    @pytest.mark.parametrize("amount,fragment", [
+        (0.00, "at least"),
+        (2000000.00, "cannot exceed"),
+        (100.123, "at most 2 decimal places")
+    ])
+    def test_invalid_amounts(self, amount, fragment):
+        """Test amounts below minimum, above maximum, or with extra decimals."""
+        is_valid, error = ClaimValidator.validate_amount(amount)
         assert not is_valid
-        assert "at most 2 decimal places" in error
+        assert fragment in error
 
 
 class TestDateRangeValidation:
     """Test date range validation."""
-    
+
     def test_valid_date_range(self):
         """Test valid date range."""
         start = datetime.utcnow() - timedelta(days=30)
@@ -160,7 +158,7 @@ class TestDateRangeValidation:
         is_valid, error = ClaimValidator.validate_date_range(start, end)
         assert is_valid
         assert error is None
-    
+
     def test_start_after_end(self):
         """Test start date after end date."""
         start = datetime.utcnow()
@@ -168,7 +166,7 @@ class TestDateRangeValidation:
         is_valid, error = ClaimValidator.validate_date_range(start, end)
         assert not is_valid
         assert "before end date" in error
-    
+
     def test_future_date(self):
         """Test future date."""
         start = datetime.utcnow() - timedelta(days=1)
@@ -176,7 +174,7 @@ class TestDateRangeValidation:
         is_valid, error = ClaimValidator.validate_date_range(start, end)
         assert not is_valid
         assert "cannot be in the future" in error
-    
+
     def test_date_too_old(self):
         """Test date too far in the past."""
         start = datetime.utcnow() - timedelta(days=3700)  # >10 years
@@ -188,7 +186,7 @@ class TestDateRangeValidation:
 
 class TestValidateAll:
     """Test comprehensive validation."""
-    
+
     def test_valid_claim_data(self):
         """Test validation of complete valid claim data."""
         claim_data = {
@@ -200,7 +198,7 @@ class TestValidateAll:
         }
         errors = ClaimValidator.validate_all(claim_data)
         assert len(errors) == 0
-    
+
     def test_invalid_claim_data_multiple_errors(self):
         """Test validation with multiple errors."""
         claim_data = {
@@ -219,4 +217,3 @@ class TestValidateAll:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
-
@@ -1,185 +1,375 @@
 # validators.py - Data Validators
 
+import re
+from functools import lru_cache
 from typing import List, Optional, Tuple
 from datetime import datetime
-import re
+import numpy as np
 from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Characters allowed in patient IDs (both cases, so no .upper() copy
+# is needed before checking)
+_PID_ALLOWED = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-"
+)
+
+# Digit sum of 2*d for d in 0..9, for the Luhn doubled positions
+_LUHN_DOUBLE = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+_LUHN_TBL = np.array(_LUHN_DOUBLE, dtype=np.uint8)
+
+# Below this batch size the scalar loop wins over NumPy setup cost
+_LUHN_BATCH_MIN = 50
+
+# Below this many codes the memoized scalar checks win over the
+# join + single-regex bulk pass
+_CODE_BATCH_MIN = 50
+
+# Anchored per-line patterns for bulk code validation: one regex
+# engine entry scans a whole joined batch. ASCII keeps parity with
+# the scalar checks, which reject unicode digits
+_BULK_ICD10 = re.compile(
+    r'^[A-Z]\d{2}(?:\.\d{1,4})?$', re.MULTILINE | re.IGNORECASE | re.ASCII
+)
+_BULK_CPT = re.compile(r'^\d{5}$', re.MULTILINE | re.ASCII)
+
 class ValidationError(Exception):
     """Custom exception for validation errors."""
     pass
 
+# Validators live at module level: none of them touch instance state,
+# and plain functions skip the staticmethod descriptor and the extra
+# attribute lookup that ClaimValidator.validate_x pays per call. The
+# class below keeps the old namespace working.
+
+def validate_patient_id(patient_id: str) -> Tuple[bool, Optional[str]]:
+    """
+    Validate patient ID format.
+    Returns: (is_valid, error_message)
+    """
+    if not patient_id or len(patient_id.strip()) == 0:
+        return False, "Patient ID cannot be empty"
+
+    # Check length (typically 6-20 characters)
+    if len(patient_id) < 6 or len(patient_id) > 20:
+        return False, "Patient ID must be between 6 and 20 characters"
+
+    # Check format (alphanumeric with optional hyphens): set probes
+    # over a 6-20 char string beat regex engine startup
+    if not all(c in _PID_ALLOWED for c in patient_id):
+        return False, "Patient ID must contain only letters, numbers, and hyphens"
+
+    return True, None
+
+def validate_provider_npi(npi: str) -> Tuple[bool, Optional[str]]:
+    """
+    Validate NPI (National Provider Identifier) format.
+    NPI is a 10-digit number.
+    """
+    if not npi:
+        return True, None  # NPI is optional
+
+    # Remove any spaces or hyphens; str.replace beats a
+    # character-class regex on strings this short
+    cleaned_npi = npi.replace(' ', '').replace('-', '')
+
+    # Check if it's exactly 10 digits (ASCII only — the \d regex
+    # this replaces also let unicode digits through)
+    if len(cleaned_npi) != 10 or not (cleaned_npi.isascii() and cleaned_npi.isdigit()):
+        return False, "NPI must be exactly 10 digits"
+
+    # Luhn algorithm check for NPI validation
+    if not _luhn_check(cleaned_npi):
+        return False, "Invalid NPI checksum"
+
+    return True, None
+
+@lru_cache(maxsize=4096)
+def _luhn_check(number: str) -> bool:
+    """
+    Validate number using Luhn algorithm.
+
+    Single pass over the string with a precomputed doubled-digit
+    table — no per-digit int/str round-trips or temporary lists —
+    and memoized so repeat NPIs in batched validation hit a dict
+    lookup.
+    """
+    checksum = 0
+    for i, ch in enumerate(reversed(number)):
+        d = ord(ch) - 48
+        checksum += d if (i & 1) == 0 else _LUHN_DOUBLE[d]
+
+    return checksum % 10 == 0
+
+def _luhn_check_batch(npis: List[str]) -> np.ndarray:
+    """
+    Vectorized Luhn check for a batch of cleaned 10-digit strings.
+
+    Packs the digits into an (N, 10) uint8 array and evaluates the
+    checksum with table indexing and two axis sums, so the per-NPI
+    interpreter loop disappears. Small batches fall back to the
+    scalar path, which wins below NumPy's setup cost.
+
+    Returns:
+        Boolean array, True where the checksum is valid
+    """
+    if len(npis) < _LUHN_BATCH_MIN:
+        return np.fromiter(
+            (_luhn_check(npi) for npi in npis),
+            dtype=bool,
+            count=len(npis)
+        )
+
+    arr = np.frombuffer(''.join(npis).encode('ascii'), dtype=np.uint8).reshape(-1, 10) - 48
+    doubled = _LUHN_TBL[arr[:, -2::-2]]
+    singles = arr[:, -1::-2]
+    sums = doubled.sum(axis=1, dtype=np.int64) + singles.sum(axis=1, dtype=np.int64)
+
+    return (sums % 10) == 0
+
+def _icd10_ok(code: str) -> bool:
+    """
+    Hand-coded check for the ICD-10 shape: letter + 2 digits +
+    optional decimal and 1-4 more digits (case-insensitive letter).
+    Straight character tests, no regex engine entry.
+    """
+    n = len(code)
+    if n < 3 or n > 8:
+        return False
+    if not ('A' <= code[0].upper() <= 'Z'):
+        return False
+    body = code[1:3]
+    if not (body.isascii() and body.isdigit()):
+        return False
+    if n == 3:
+        return True
+    if code[3] != '.':
+        return False
+    tail = code[4:]
+    return tail.isascii() and tail.isdigit()
+
+# The code checks are memoized: real claim streams repeat the same
+# few hundred ICD-10/CPT codes across thousands of claims, so
+# repeats become a dict lookup
+
+@lru_cache(maxsize=4096)
+def validate_diagnosis_code(code: str) -> Tuple[bool, Optional[str]]:
+    """
+    Validate ICD-10 diagnosis code format.
+    """
+    if not code:
+        return False, "Diagnosis code cannot be empty"
+
+    if not _icd10_ok(code):
+        return False, "Invalid ICD-10 code format (e.g., A00, A00.1, A00.12)"
+
+    return True, None
+
+@lru_cache(maxsize=4096)
+def validate_procedure_code(code: str) -> Tuple[bool, Optional[str]]:
+    """
+    Validate CPT procedure code format.
+    """
+    if not code:
+        return False, "Procedure code cannot be empty"
+
+    # CPT codes are 5 digits; a length + isdigit check beats the
+    # regex for such a short fixed-width field (isascii guards
+    # against the unicode digits isdigit would otherwise accept)
+    if len(code) != 5 or not (code.isascii() and code.isdigit()):
+        return False, "CPT code must be exactly 5 digits"
+
+    return True, None
+
+def _validate_codes_bulk(codes: List[str], pattern, scalar_check) -> List[Tuple[str, str]]:
+    """
+    Bulk-validate a batch of codes, returning (code, error) pairs
+    for the invalid ones.
+
+    Joins the batch into one newline-separated buffer and marks the
+    valid lines with a single multiline-regex pass, so the regex
+    engine is entered once per batch instead of once per code. Only
+    the invalid codes then go through the scalar check, which keeps
+    the error messages identical to the per-code path. Small batches
+    skip the join and use the memoized scalar check directly.
+    """
+    if len(codes) < _CODE_BATCH_MIN:
+        return [
+            (code, error)
+            for code, (is_valid, error) in ((c, scalar_check(c)) for c in codes)
+            if not is_valid
+        ]
+
+    # Start offset of each line in the joined buffer; anchored matches
+    # begin exactly at one of these, so offsets map back to indices
+    offsets = {}
+    pos = 0
+    for i, code in enumerate(codes):
+        offsets[pos] = i
+        pos += len(code) + 1
+
+    valid = bytearray(len(codes))
+    joined = '\n'.join(codes)
+    for match in pattern.finditer(joined):
+        index = offsets.get(match.start())
+        # The match must cover the whole code: a code with an embedded
+        # newline can match its first line alone, which the scalar
+        # check rightly rejects
+        if index is not None and match.end() - match.start() == len(codes[index]):
+            valid[index] = 1
+
+    return [
+        (code, scalar_check(code)[1])
+        for code, ok in zip(codes, valid)
+        if not ok
+    ]
+
+def validate_diagnosis_codes(codes: List[str]) -> List[Tuple[str, str]]:
+    """
+    Bulk-validate ICD-10 diagnosis codes.
+    Returns: list of (code, error_message) for the invalid codes
+    """
+    return _validate_codes_bulk(codes, _BULK_ICD10, validate_diagnosis_code)
+
+def validate_procedure_codes(codes: List[str]) -> List[Tuple[str, str]]:
+    """
+    Bulk-validate CPT procedure codes.
+    Returns: list of (code, error_message) for the invalid codes
+    """
+    return _validate_codes_bulk(codes, _BULK_CPT, validate_procedure_code)
+
+def validate_amount(amount: float, min_amount: float = 0.01, max_amount: float = 1000000) -> Tuple[bool, Optional[str]]:
+    """
+    Validate claim amount.
+    """
+    # Work in integer cents: one scale + round, then integer
+    # compares, instead of float rounds per check
+    scaled = amount * 100
+    cents = round(scaled)
+
+    if cents < round(min_amount * 100):
+        return False, f"Amount must be at least ${min_amount}"
+
+    if cents > round(max_amount * 100):
+        return False, f"Amount cannot exceed ${max_amount}"
+
+    # Check for reasonable decimal places (max 2); the tolerance
+    # absorbs binary-float representation error on valid amounts
+    if abs(scaled - cents) > 1e-6:
+        return False, "Amount can have at most 2 decimal places"
+
+    return True, None
+
+def validate_date_range(start_date: datetime, end_date: datetime) -> Tuple[bool, Optional[str]]:
+    """
+    Validate date range.
+    """
+    if start_date > end_date:
+        return False, "Start date must be before end date"
+
+    now = datetime.utcnow()
+
+    # Check if dates are not too far in the past (e.g., 10 years)
+    if start_date < now.replace(year=now.year - 10):
+        return False, "Date is too far in the past"
+
+    # Check if dates are not in the future
+    if end_date > now:
+        return False, "Date cannot be in the future"
+
+    return True, None
+
+def validate_all(claim_data: dict, fail_fast: bool = False) -> List[str]:
+    """
+    Validate all claim data and return list of errors.
+
+    With fail_fast=True, the first error is returned immediately —
+    useful for reject-on-any-error callers, which skip the
+    remaining checks on malformed claims. Repeated codes are
+    deduplicated before validation so no code is checked twice.
+    """
+    errors = []
+
+    # Validate patient ID
+    if 'patient_id' in claim_data:
+        is_valid, error = validate_patient_id(claim_data['patient_id'])
+        if not is_valid:
+            errors.append(f"Patient ID: {error}")
+            if fail_fast:
+                return errors
+
+    # Validate provider NPI
+    if claim_data.get('provider_id'):
+        is_valid, error = validate_provider_npi(claim_data['provider_id'])
+        if not is_valid:
+            errors.append(f"Provider NPI: {error}")
+            if fail_fast:
+                return errors
+
+    # Validate amount
+    if 'total_amount' in claim_data:
+        is_valid, error = validate_amount(claim_data['total_amount'])
+        if not is_valid:
+            errors.append(f"Amount: {error}")
+            if fail_fast:
+                return errors
+
+    # Validate diagnosis codes (local bindings: no global lookup per
+    # code in the hot loops)
+    append_error = errors.append
+    _vicd = validate_diagnosis_code
+    _vcpt = validate_procedure_code
+    for code in dict.fromkeys(claim_data.get('diagnosis_codes') or ()):
+        is_valid, error = _vicd(code)
+        if not is_valid:
+            append_error(f"Diagnosis code '{code}': {error}")
+            if fail_fast:
+                return errors
+
+    # Validate procedure codes
+    for code in dict.fromkeys(claim_data.get('procedure_codes') or ()):
+        is_valid, error = _vcpt(code)
+        if not is_valid:
+            append_error(f"Procedure code '{code}': {error}")
+            if fail_fast:
+                return errors
+
+    logger.info(f"Validation complete: {len(errors)} errors found")
+    return errors
+
 class ClaimValidator:
-    """Validator for claim data."""
-    
-    @staticmethod
-    def validate_patient_id(patient_id: str) -> Tuple[bool, Optional[str]]:
-        """
-        Validate patient ID format.
-        Returns: (is_valid, error_message)
-        """
-        if not patient_id or len(patient_id.strip()) == 0:
-            return False, "Patient ID cannot be empty"
-        
-        # Check length (typically 6-20 characters)
-        if len(patient_id) < 6 or len(patient_id) > 20:
-            return False, "Patient ID must be between 6 and 20 characters"
-        
-        # Check format (alphanumeric with optional hyphens)
-        if not re.match(r'^[A-Z0-9\-]+$', patient_id.upper()):
-            return False, "Patient ID must contain only letters, numbers, and hyphens"
-        
-        return True, None
-    
-    @staticmethod
-    def validate_provider_npi(npi: str) -> Tuple[bool, Optional[str]]:
-        """
-        Validate NPI (National Provider Identifier) format.
-        NPI is a 10-digit number.
-        """
-        if not npi:
-            return True, None  # NPI is optional
-        
-        # Remove any spaces or hyphens
-        cleaned_npi = re.sub(r'[\s\-]', '', npi)
-        
-        # Check if it's exactly 10 digits
-        if not re.match(r'^\d{10}$', cleaned_npi):
-            return False, "NPI must be exactly 10 digits"
-        
-        # Luhn algorithm check for NPI validation
-        if not ClaimValidator._luhn_check(cleaned_npi):
-            return False, "Invalid NPI checksum"
-        
-        return True, None
-    
-    @staticmethod
-    def _luhn_check(number: str) -> bool:
-        """
-        Validate number using Luhn algorithm.
-        """
-        def digits_of(n):
-            return [int(d) for d in str(n)]
-        
-        digits = digits_of(number)
-        odd_digits = digits[-1::-2]
-        even_digits = digits[-2::-2]
-        
-        checksum = sum(odd_digits)
-        for d in even_digits:
-            checksum += sum(digits_of(d * 2))
-        
-        return checksum % 10 == 0
-    
-    @staticmethod
-    def validate_diagnosis_code(code: str) -> Tuple[bool, Optional[str]]:
-        """
-        Validate ICD-10 diagnosis code format.
-        """
-        if not code:
-            return False, "Diagnosis code cannot be empty"
-        
-        # ICD-10 format: Letter + 2 digits + optional decimal + up to 4 more digits
-        pattern = r'^[A-Z]\d{2}(?:\.\d{1,4})?$'
-        
-        if not re.match(pattern, code.upper()):
-            return False, "Invalid ICD-10 code format (e.g., A00, A00.1, A00.12)"
-        
-        return True, None
-    
-    @staticmethod
-    def validate_procedure_code(code: str) -> Tuple[bool, Optional[str]]:
-        """
-        Validate CPT procedure code format.
-        """
-        if not code:
-            return False, "Procedure code cannot be empty"
-        
-        # CPT codes are 5 digits
-        if not re.match(r'^\d{5}$', code):
-            return False, "CPT code must be exactly 5 digits"
-        
-        return True, None
-    
-    @staticmethod
-    def validate_amount(amount: float, min_amount: float = 0.01, max_amount: float = 1000000) -> Tuple[bool, Optional[str]]:
-        """
-        Validate claim amount.
-        """
-        if amount < min_amount:
-            return False, f"Amount must be at least ${min_amount}"
-        
-        if amount > max_amount:
-            return False, f"Amount cannot exceed ${max_amount}"
-        
-        # Check for reasonable decimal places (max 2)
-        if round(amount, 2) != amount:
-            return False, "Amount can have at most 2 decimal places"
-        
-        return True, None
-    
-    @staticmethod
-    def validate_date_range(start_date: datetime, end_date: datetime) -> Tuple[bool, Optional[str]]:
-        """
-        Validate date range.
-        """
-        if start_date > end_date:
-            return False, "Start date must be before end date"
-        
-        # Check if dates are not too far in the past (e.g., 10 years)
-        max_age = datetime.utcnow().replace(year=datetime.utcnow().year - 10)
-        if start_date < max_age:
-            return False, "Date is too far in the past"
-        
-        # Check if dates are not in the future
-        if end_date > datetime.utcnow():
-            return False, "Date cannot be in the future"
-        
-        return True, None
-    
-    @staticmethod
-    def validate_all(claim_data: dict) -> List[str]:
-        """
-        Validate all claim data and return list of errors.
-        """
-        errors = []
-        
-        # Validate patient ID
-        if 'patient_id' in claim_data:
-            is_valid, error = ClaimValidator.validate_patient_id(claim_data['patient_id'])
-            if not is_valid:
-                errors.append(f"Patient ID: {error}")
-        
-        # Validate provider NPI
-        if 'provider_id' in claim_data and claim_data['provider_id']:
-            is_valid, error = ClaimValidator.validate_provider_npi(claim_data['provider_id'])
-            if not is_valid:
-                errors.append(f"Provider NPI: {error}")
-        
-        # Validate amount
-        if 'total_amount' in claim_data:
-            is_valid, error = ClaimValidator.validate_amount(claim_data['total_amount'])
-            if not is_valid:
-                errors.append(f"Amount: {error}")
-        
-        # Validate diagnosis codes
-        if 'diagnosis_codes' in claim_data:
-            for code in claim_data['diagnosis_codes']:
-                is_valid, error = ClaimValidator.validate_diagnosis_code(code)
-                if not is_valid:
-                    errors.append(f"Diagnosis code '{code}': {error}")
-        
-        # Validate procedure codes
-        if 'procedure_codes' in claim_data:
-            for code in claim_data['procedure_codes']:
-                is_valid, error = ClaimValidator.validate_procedure_code(code)
-                if not is_valid:
-                    errors.append(f"Procedure code '{code}': {error}")
-        
-        logger.info(f"Validation complete: {len(errors)} errors found")
-        return errors
+    """
+    Validator for claim data.
+
+    Thin namespace over the module-level validators, kept for
+    backwards compatibility — internal callers use the functions
+    directly and skip the class-attribute lookup.
+    """
+
+    validate_patient_id = staticmethod(validate_patient_id)
+    validate_provider_npi = staticmethod(validate_provider_npi)
+    _luhn_check = staticmethod(_luhn_check)
+    _luhn_check_batch = staticmethod(_luhn_check_batch)
+    validate_diagnosis_code = staticmethod(validate_diagnosis_code)
+    validate_procedure_code = staticmethod(validate_procedure_code)
+    validate_diagnosis_codes = staticmethod(validate_diagnosis_codes)
+    validate_procedure_codes = staticmethod(validate_procedure_codes)
+    validate_amount = staticmethod(validate_amount)
+    validate_date_range = staticmethod(validate_date_range)
+    validate_all = staticmethod(validate_all)
 
 # Export
-__all__ = ["ClaimValidator", "ValidationError"]
+__all__ = [
+    "ClaimValidator",
+    "ValidationError",
+    "validate_patient_id",
+    "validate_provider_npi",
+    "validate_diagnosis_code",
+    "validate_procedure_code",
+    "validate_diagnosis_codes",
+    "validate_procedure_codes",
+    "validate_amount",
+    "validate_date_range",
+    "validate_all"
+]